@@ -1,100 +1,147 @@
-from abc import ABC, abstractmethod
+import weakref
 from copy import deepcopy
-from io import StringIO
 
 
-class TreePrinter:
-    """Helper class for tree-related printing logic."""
+# Соединители и отступы дерева, индексируются флагом is_last
+_CONN = ("+-", "\\-")
+_SUBP = ("| ", "  ")
 
-    @staticmethod
-    def tree_connector(is_last):
-        return "\\-" if is_last else "+-"
 
-    @staticmethod
-    def is_last(index, items):
-        return index == len(items) - 1
+def _new_copy(self, base, memo):
+    """Allocate a copy of self for base.__deepcopy__ and register it in memo.
+    State added by subclasses of base is deep-copied generically."""
+    cls = type(self)
+    new = cls.__new__(cls)
+    memo[id(self)] = new
+    if cls is base:
+        return new
 
-    @staticmethod
-    def sub_prefix(prefix, is_last):
-        return prefix + ("  " if is_last else "| ")
+    for klass in cls.__mro__[: cls.__mro__.index(base)]:
+        slots = vars(klass).get("__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name in ("__dict__", "__weakref__"):
+                continue
+            if name.startswith("__") and not name.endswith("__"):
+                name = f"_{klass.__name__.lstrip('_')}{name}"
+            if hasattr(self, name):
+                setattr(new, name, deepcopy(getattr(self, name), memo))
 
+    state = getattr(self, "__dict__", None)
+    if state:
+        new.__dict__.update(deepcopy(state, memo))
+    return new
 
-class Printable(ABC):
-    """Base abstract class for printable objects."""
 
-    @abstractmethod
+class Printable:
+    """Base class for printable objects."""
+
+    __slots__ = ("__weakref__", "_owners")
+
+    def __init__(self):
+        self._owners = []
+
     def print_me(self, os, prefix="", is_last=False):
         """Base printing method for the tree structure display.
-        Implement properly to display hierarchical structure."""
-        pass
+        Implement properly to display hierarchical structure.
+        os is a writer callable (e.g. list.append) or a stream with write()."""
+        raise NotImplementedError
 
     def clone(self):
         """Create a deep copy of this object."""
         return deepcopy(self)
 
     def __str__(self):
-        os = StringIO()
-        self.print_me(os)
-        return os.getvalue().rstrip()
+        buf = []
+        self.print_me(buf.append)
+        return "".join(buf).rstrip()
+
+    def _add_owner(self, owner):
+        """Remember a container weakly to invalidate its cached output."""
+        owners = getattr(self, "_owners", None)
+        if owners is None:
+            # Подкласс мог не вызвать super().__init__()
+            self._owners = owners = []
+        owners[:] = [ref for ref in owners if ref() is not None]
+        ref = weakref.ref(owner)
+        if ref not in owners:
+            owners.append(ref)
+
+    def _invalidate(self):
+        """Drop the cached output of the owning networks after a change."""
+        for ref in getattr(self, "_owners", ()):
+            owner = ref()
+            if owner is not None:
+                owner._invalidate()
 
 
 class BasicCollection(Printable):
     """Base class for collections of items."""
 
+    __slots__ = ()
+
 
 class Component(Printable):
     """Base class for computer components."""
 
+    __slots__ = ()
 
-class Address(Printable):
-    """Class representing a network address."""
-
-    def __init__(self, addr):
-        self._address = addr
-
-    def print_me(self, os, prefix="", is_last=True):
-        os.write(f"{prefix}{TreePrinter.tree_connector(is_last)}{self._address}\n")
-
-    @property
-    def address(self):
-        return self._address
+    def __deepcopy__(self, memo):
+        # Владельцы не копируются: их назначает копия контейнера
+        new = _new_copy(self, Component, memo)
+        new._owners = []
+        return new
 
 
 class Computer(BasicCollection):
-    """Class representing a computer with addresses and components."""
+    """Class representing a computer with addresses and components.
+    Chained add_* calls suit a few items; prefer extend_* for bulk loads.
+    addresses and components are read-only tuples so every change goes
+    through add_*/extend_* and invalidates cached network output."""
+
+    __slots__ = ("_name", "_addresses", "_components")
 
     def __init__(self, name):
+        super().__init__()
         self._name = name
         self._addresses = []
         self._components = []
 
+    def __deepcopy__(self, memo):
+        new = _new_copy(self, Computer, memo)
+        new._name = self._name
+        new._addresses = list(self._addresses)
+        new._components = [deepcopy(c, memo) for c in self._components]
+        for comp in new._components:
+            comp._add_owner(new)
+        new._owners = []
+        return new
+
     def add_address(self, addr):
-        self._addresses.append(Address(addr))
+        self._addresses.append(addr)
+        self._invalidate()
         return self
 
     def add_component(self, comp):
+        comp._add_owner(self)
         self._components.append(comp)
+        self._invalidate()
         return self
 
-    def print_me(self, os, prefix="", is_last=True):
-        os.write(f"{prefix}{TreePrinter.tree_connector(is_last)}Host: {self._name}\n")
-
-        sub_prefix = TreePrinter.sub_prefix(prefix, is_last)
+    def extend_addresses(self, addrs):
+        self._addresses.extend(addrs)
+        self._invalidate()
+        return self
 
-        for i, addr in enumerate(self._addresses):
-            addr.print_me(
-                os,
-                sub_prefix,
-                is_last=(
-                    TreePrinter.is_last(i, self._addresses)
-                    and len(self._components) == 0
-                ),
-            )
+    def extend_components(self, comps):
+        comps = list(comps)
+        for comp in comps:
+            comp._add_owner(self)
+        self._components.extend(comps)
+        self._invalidate()
+        return self
 
-        for i, comp in enumerate(self._components):
-            comp.print_me(
-                os, sub_prefix, is_last=(TreePrinter.is_last(i, self._components))
-            )
+    def print_me(self, os, prefix="", is_last=True):
+        _print_tree(self, _emit_computer, os, prefix, is_last)
 
     @property
     def name(self):
@@ -102,34 +149,59 @@ class Computer(BasicCollection):
 
     @property
     def addresses(self):
-        return self._addresses
+        return tuple(self._addresses)
 
     @property
     def components(self):
-        return self._components
+        return tuple(self._components)
 
 
 class Network(Printable):
     """Class representing a network of computers."""
 
+    __slots__ = ("_name", "_computers", "_by_name", "_cached_str")
+
     def __init__(self, name):
+        super().__init__()
         self._name = name
         self._computers = []
+        self._by_name = {}
+        self._cached_str = None
+
+    def __deepcopy__(self, memo):
+        new = _new_copy(self, Network, memo)
+        new._name = self._name
+        new._computers = [deepcopy(c, memo) for c in self._computers]
+        new._by_name = {}
+        for comp in new._computers:
+            comp._add_owner(new)
+            new._by_name.setdefault(comp.name, comp)
+        new._cached_str = self._cached_str
+        new._owners = []
+        return new
 
     def add_computer(self, comp):
+        # При совпадении имён поиск возвращает первый добавленный компьютер
+        self._by_name.setdefault(comp.name, comp)
+        comp._add_owner(self)
         self._computers.append(comp)
+        self._invalidate()
         return self
 
     def find_computer(self, name):
-        for comp in self._computers:
-            if comp.name == name:
-                return comp
-        return None
+        return self._by_name.get(name)
+
+    def _invalidate(self):
+        self._cached_str = None
+
+    def __str__(self):
+        # Вывод кешируется до первого изменения сети или её элементов
+        if self._cached_str is None:
+            self._cached_str = super().__str__()
+        return self._cached_str
 
     def print_me(self, os, prefix="", is_last=True):
-        os.write(f"Network: {self._name}\n")
-        for i, comp in enumerate(self._computers):
-            comp.print_me(os, "", TreePrinter.is_last(i, self._computers))
+        _print_tree(self, _emit_network, os, prefix, is_last)
 
     @property
     def name(self):
@@ -137,40 +209,45 @@ class Network(Printable):
 
     @property
     def computers(self):
-        return self._computers
+        # Только для чтения: добавление идёт через add_computer и индекс имён
+        return tuple(self._computers)
 
 
 class Disk(Component):
     """Disk component class with partitions."""
 
+    __slots__ = ("_storage_type", "_size", "_sizes", "_names")
+
     # Определение типов дисков
     SSD = 0
     MAGNETIC = 1
 
     def __init__(self, storage_type, size):
+        super().__init__()
         self._storage_type = storage_type
         self._size = size
-        self._partitions = []
+        # Разделы хранятся параллельными списками размеров и имён
+        self._sizes = []
+        self._names = []
+
+    def __deepcopy__(self, memo):
+        new = _new_copy(self, Disk, memo)
+        new._storage_type = self._storage_type
+        new._size = self._size
+        # Элементы (int и str) неизменяемы, достаточно копии списков
+        new._sizes = list(self._sizes)
+        new._names = list(self._names)
+        new._owners = []
+        return new
 
     def add_partition(self, size, name):
-        self._partitions.append((size, name))
+        self._sizes.append(size)
+        self._names.append(name)
+        self._invalidate()
         return self
 
     def print_me(self, os, prefix="", is_last=True):
-        disk_type = "SSD" if self._storage_type == Disk.SSD else "HDD"
-
-        os.write(
-            f"{prefix}{TreePrinter.tree_connector(is_last)}{disk_type}, {self._size} GiB\n"
-        )
-
-        part_prefix = TreePrinter.sub_prefix(prefix, is_last)
-
-        for i, (size, name) in enumerate(self._partitions):
-            last = TreePrinter.is_last(i, self._partitions)
-
-            os.write(
-                f"{part_prefix}{TreePrinter.tree_connector(last)}[{i}]: {size} GiB, {name}\n"
-            )
+        _print_tree(self, _emit_disk, os, prefix, is_last)
 
     @property
     def storage_type(self):
@@ -182,20 +259,28 @@ class Disk(Component):
 
     @property
     def partitions(self):
-        return self._partitions
+        return tuple(zip(self._sizes, self._names))
 
 
 class CPU(Component):
     """CPU component class."""
 
+    __slots__ = ("_cores", "_mhz")
+
     def __init__(self, cores, mhz):
+        super().__init__()
         self._cores = cores
         self._mhz = mhz
 
+    def __deepcopy__(self, memo):
+        new = _new_copy(self, CPU, memo)
+        new._cores = self._cores
+        new._mhz = self._mhz
+        new._owners = []
+        return new
+
     def print_me(self, os, prefix="", is_last=True):
-        os.write(
-            f"{prefix}{TreePrinter.tree_connector(is_last)}CPU, {self._cores} cores @ {self._mhz}MHz\n"
-        )
+        _print_tree(self, _emit_cpu, os, prefix, is_last)
 
     @property
     def cores(self):
@@ -209,19 +294,114 @@ class CPU(Component):
 class Memory(Component):
     """Memory component class."""
 
+    __slots__ = ("_size",)
+
     def __init__(self, size):
+        super().__init__()
         self._size = size
 
+    def __deepcopy__(self, memo):
+        new = _new_copy(self, Memory, memo)
+        new._size = self._size
+        new._owners = []
+        return new
+
     def print_me(self, os, prefix="", is_last=True):
-        os.write(
-            f"{prefix}{TreePrinter.tree_connector(is_last)}Memory, {self._size} MiB\n"
-        )
+        _print_tree(self, _emit_memory, os, prefix, is_last)
 
     @property
     def size(self):
         return self._size
 
 
+def _emit_network(node, os, prefix, is_last, stack):
+    os(f"Network: {node._name}\n")
+
+    computers = node._computers
+    last = len(computers) - 1
+    for i in range(last, -1, -1):
+        stack.append((computers[i], "", i == last))
+
+
+def _emit_computer(node, os, prefix, is_last, stack):
+    os(f"{prefix}{_CONN[is_last]}Host: {node._name}\n")
+
+    sub_prefix = prefix + _SUBP[is_last]
+
+    components = node._components
+    addresses = node._addresses
+    last_a = len(addresses) - 1
+    no_comp = not components
+    for i, addr in enumerate(addresses):
+        os(f"{sub_prefix}{_CONN[i == last_a and no_comp]}{addr}\n")
+
+    # Компоненты - листья дерева, выводятся сразу через таблицу по типу
+    last_c = len(components) - 1
+    for i, comp in enumerate(components):
+        emit = _EMITTERS.get(type(comp)) or _emitter_for(type(comp))
+        emit(comp, os, sub_prefix, i == last_c, stack)
+
+
+def _emit_disk(node, os, prefix, is_last, stack):
+    disk_type = "SSD" if node._storage_type == Disk.SSD else "HDD"
+
+    os(f"{prefix}{_CONN[is_last]}{disk_type}, {node._size} GiB\n")
+
+    part_prefix = prefix + _SUBP[is_last]
+
+    sizes = node._sizes
+    names = node._names
+    last = len(sizes) - 1
+    for i in range(last + 1):
+        os(f"{part_prefix}{_CONN[i == last]}[{i}]: {sizes[i]} GiB, {names[i]}\n")
+
+
+def _emit_cpu(node, os, prefix, is_last, stack):
+    os(f"{prefix}{_CONN[is_last]}CPU, {node._cores} cores @ {node._mhz}MHz\n")
+
+
+def _emit_memory(node, os, prefix, is_last, stack):
+    os(f"{prefix}{_CONN[is_last]}Memory, {node._size} MiB\n")
+
+
+def _emit_custom(node, os, prefix, is_last, stack):
+    node.print_me(os, prefix, is_last)
+
+
+_EMITTERS = {
+    Network: _emit_network,
+    Computer: _emit_computer,
+    Disk: _emit_disk,
+    CPU: _emit_cpu,
+    Memory: _emit_memory,
+}
+
+
+def _emitter_for(cls):
+    """Resolve and cache the emitter of a class not in the table.
+    A class whose print_me is overridden is printed through that method."""
+    for base in cls.__mro__:
+        if "print_me" in vars(base):
+            emit = _EMITTERS.get(base, _emit_custom)
+            _EMITTERS[cls] = emit
+            return emit
+    raise TypeError(f"Cannot print {cls.__name__} object")
+
+
+def _print_tree(root, emit, os, prefix="", is_last=True):
+    """Iterative depth-first tree printing with an explicit stack.
+    The root is printed by emit, the rest is dispatched by node type.
+    Children are pushed in reverse order to keep the output order."""
+    os = getattr(os, "write", os)
+    stack = []
+    emit(root, os, prefix, is_last, stack)
+
+    while stack:
+        node, prefix, is_last = stack.pop()
+        emit = _EMITTERS.get(type(node)) or _emitter_for(type(node))
+        emit(node, os, prefix, is_last, stack)
+
+
 # Пример использования (может быть неполным или содержать ошибки)
 def main():
     # Создание тестовой сети
@@ -315,6 +495,41 @@ def main():
         assert expected_type in str(disk), f"Неверный тип диска в выводе: {str(disk)}"
     print("✓ Тест типов дисков пройден")
 
+    # Тест сброса кеша вывода после изменения элементов сети
+    cache_net = Network("cache").add_computer(Computer("host"))
+    other_net = Network("other").add_computer(cache_net.find_computer("host"))
+    host = cache_net.find_computer("host")
+    disk = Disk(Disk.SSD, 100)
+    host.add_component(disk)
+    cached = [str(net) for net in (cache_net, other_net)]
+    for text in cached:
+        assert "127.0.0.1" not in text, "Адрес выведен до его добавления"
+
+    host.add_address("127.0.0.1")
+    for net in (cache_net, other_net):
+        assert "127.0.0.1" in str(net), "Кеш вывода не сброшен после add_address"
+
+    disk.add_partition(100, "boot")
+    for net in (cache_net, other_net):
+        assert "boot" in str(net), "Кеш вывода не сброшен после add_partition"
+    print("✓ Тест сброса кеша вывода пройден")
+
+    # Тест пакетного добавления: extend_* равносильны цепочке add_*
+    chained = (
+        Computer("bulk")
+        .add_address("10.0.0.2")
+        .add_address("10.0.0.3")
+        .add_component(CPU(2, 1800))
+        .add_component(Memory(4096))
+    )
+    bulk = (
+        Computer("bulk")
+        .extend_addresses(["10.0.0.2", "10.0.0.3"])
+        .extend_components([CPU(2, 1800), Memory(4096)])
+    )
+    assert str(bulk) == str(chained), "extend_* выводит иначе, чем add_*"
+    print("✓ Тест пакетного добавления пройден")
+
     print("\nВсе тесты пройдены!")
 
 